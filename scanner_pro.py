@@ -8,153 +8,573 @@ Date: 25 OCT 2025
 
 Description:
 This script scans a user-specified range of IPv4 addresses for an open TCP port
-(default port 80). It determines which hosts are online using socket.connect_ex(),
-records response time, and saves the results into a structured CSV file.
+(default port 80). It determines which hosts are online using asyncio non-blocking
+connects, records response time, and saves the results into a structured CSV file.
 """
 
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
 import socket
+import struct
 import csv
 import ipaddress
+import itertools
+import os
 import time
 import sys
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+try:
+    import resource
+except ImportError:  # Windows has no resource module
+    resource = None
+
+# Optional speed-up: uvloop replaces the default selector event loop with
+# libuv, which dispatches connect completions with far less overhead per
+# probe. Fall back silently to the standard loop when it is not installed.
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    uvloop = None
+
+# Not exposed by the socket module on every platform; value from
+# linux/socket.h
+SO_BUSY_POLL = getattr(socket, 'SO_BUSY_POLL', 46)
 
 # Global flag to control scanning
 scanning_active = True
 
+# Sweeps of at least this many probes (IPs x ports) are sharded across CPU
+# cores; below it the worker start-up cost outweighs the parallelism
+MULTIPROCESS_THRESHOLD = 4096
+
+# Bounds for the adaptive concurrency controller in scan_ip_range_async
+MIN_CONCURRENCY = 50
+MAX_CONCURRENCY = 5000
+
+# Thread cap for the post-scan reverse-DNS batch
+MAX_RESOLVER_THREADS = 128
+
+# Column order for the CSV export
+CSV_FIELDS = ['ip', 'hostname', 'port', 'status', 'rtt_ms', 'timestamp', 'error']
+
+# One record per probe. A namedtuple stores its fields in a fixed C array,
+# so building millions of these is far cheaper (in time and memory) than
+# building a 7-key dict per probe. Field order matches CSV_FIELDS so a
+# record can be passed straight to csv.writer.writerow().
+ScanResult = namedtuple('ScanResult', CSV_FIELDS)
+
 # -------------------------------
 # Function: validate_ip
 # -------------------------------
-def validate_ip(ip_str):
+def validate_ip(ip_str: str) -> ipaddress.IPv4Address:
     """Validate IPv4 address format."""
     try:
         return ipaddress.IPv4Address(ip_str)
     except ipaddress.AddressValueError:
         raise ValueError(f"Invalid IP address: {ip_str}") from None
 
+# Every possible octet pre-formatted once, so expanding a range never has
+# to turn integers into strings one digit at a time
+_OCTETS = tuple(str(i) for i in range(256))
+
 # -------------------------------
 # Function: generate_ip_range
 # -------------------------------
-def generate_ip_range(start_ip_str, end_ip_str):
+def generate_ip_range(start_ip_str: str, end_ip_str: str) -> list[str]:
     """Generate a list of IP addresses from start to end (inclusive)."""
     start_ip = validate_ip(start_ip_str)
     end_ip = validate_ip(end_ip_str)
     if int(end_ip) < int(start_ip):
         raise ValueError("End IP must not be smaller than Start IP.")
-    return [str(ipaddress.IPv4Address(i)) for i in range(int(start_ip), int(end_ip) + 1)]
+    # Compose dotted quads from the cached octet table instead of building
+    # an IPv4Address object per address — roughly 10x faster on a /16
+    octets = _OCTETS
+    return ['.'.join((octets[i >> 24], octets[(i >> 16) & 0xFF],
+                      octets[(i >> 8) & 0xFF], octets[i & 0xFF]))
+            for i in range(int(start_ip), int(end_ip) + 1)]
+
+# -------------------------------
+# Function: parse_ports
+# -------------------------------
+def parse_ports(ports_str: str) -> list[int]:
+    """
+    Parse a port specification like '80', '80,443' or '1-1024,8080' into a
+    sorted list of ports. Membership is tracked in a 65536-slot bytearray
+    bitmap, so a dense range costs one slice assignment instead of one
+    set-insert per port.
+    """
+    mask = bytearray(65536)
+    for part in ports_str.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            lo_str, hi_str = part.split('-', 1)
+            lo, hi = int(lo_str), int(hi_str)
+        else:
+            lo = hi = int(part)
+        if not (1 <= lo <= hi <= 65535):
+            raise ValueError(f"Port out of range: {part}")
+        mask[lo:hi + 1] = b'\x01' * (hi - lo + 1)
+
+    ports = [p for p in range(1, 65536) if mask[p]]
+    if not ports:
+        raise ValueError("No ports specified.")
+    return ports
+
+# -------------------------------
+# Function: max_safe_concurrency
+# -------------------------------
+def max_safe_concurrency(requested: int) -> int:
+    """
+    Clamp an in-flight probe budget below the process fd soft limit.
+    Every in-flight probe holds one socket, and the stock Linux soft limit
+    of 1024 is well under the defaults used for LAN sweeps; headroom is
+    left for the CSV file, stdio, the event loop and resolver threads.
+    """
+    if resource is None:
+        return requested
+    soft = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+    if soft == resource.RLIM_INFINITY:
+        return requested
+    return max(1, min(requested, soft - 64))
 
 # -------------------------------
 # Function: scan_ip
 # -------------------------------
-def scan_ip(ip, port=80, timeout=1.0):
+async def scan_ip(ip: str, port: int = 80, timeout: float = 1.0,
+                  semaphore: asyncio.Semaphore | None = None,
+                  t0_mono: float = 0.0):
     """
     Attempt to connect to a single IP address on the given TCP port.
-    Returns a dictionary with scan details (status, RTT, etc.).
+    The connect is non-blocking: the coroutine parks in the event loop while
+    the kernel completes (or times out) the handshake, so thousands of probes
+    can be in flight on a single thread.
+    Returns a ScanResult record with scan details (status, RTT, etc.); its
+    timestamp field holds the probe's monotonic offset (seconds) from the
+    sweep anchor t0_mono — see _format_timestamp.
     """
     # Check if scanning should stop
     if not scanning_active:
         return None
 
-    result = {
-        'ip': ip,
-        'port': port,
-        'status': 'closed',
-        'hostname': '',
-        'rtt_ms': None,
-        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        'error': ''
-    }
+    if semaphore is None:
+        # Standalone use (e.g. probing one host from the REPL); the scan
+        # drivers always pass their shared budget
+        semaphore = asyncio.Semaphore(1)
+
+    status = 'closed'
+    hostname = ''
+    rtt_ms = None
+    error = ''
+
+    async with semaphore:
+        # Re-check after possibly waiting a long time for a slot
+        if not scanning_active:
+            return None
 
+        # Cheap monotonic offset instead of a full datetime.now().strftime()
+        # per probe; turned back into a wall-clock string at CSV-write time
+        timestamp = time.perf_counter() - t0_mono
+
+        loop = asyncio.get_running_loop()
+        sock = None
+        try:
+            # Created inside the try: running out of fds (EMFILE) must
+            # degrade to an 'error' row like any other OSError, not escape
+            # and abort the whole sweep
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            # Let the kernel reuse the local 4-tuple straight away, and close
+            # with an immediate RST instead of parking the socket in
+            # TIME_WAIT. A big sweep otherwise exhausts the ~28k ephemeral
+            # ports and later probes fail with EADDRNOTAVAIL, showing up as
+            # bogus 'error' rows.
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER,
+                            struct.pack('ii', 1, 0))
+            # Send any future payload (e.g. a banner-grab request) straight
+            # away instead of letting Nagle's algorithm batch it behind a
+            # delayed ACK — worth up to 40ms per probe that writes data
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if timeout < 0.1:
+                # A sub-100ms timeout implies a same-LAN sweep, where the
+                # interrupt + context switch per SYN-ACK dominates the probe
+                # time. Busy-poll the NIC for 50us instead; needs
+                # CAP_NET_ADMIN, so fall back silently when refused.
+                try:
+                    sock.setsockopt(socket.SOL_SOCKET, SO_BUSY_POLL, 50)
+                except OSError:
+                    pass
+
+            start = time.perf_counter()
+            await asyncio.wait_for(loop.sock_connect(sock, (ip, port)), timeout)
+            end = time.perf_counter()
+
+            rtt = (end - start) * 1000.0  # convert to milliseconds
+            rtt_ms = round(rtt, 2)
+            status = 'open'
+
+            # Reverse DNS is deliberately NOT done here: a missing PTR record
+            # can stall a lookup for seconds while this probe holds a
+            # semaphore slot. Open hosts are resolved in one batch afterwards
+            # (see resolve_hostnames_async).
+
+        except ConnectionRefusedError:
+            # Host is up but the port is not listening
+            status = 'closed'
+            rtt_ms = round((time.perf_counter() - start) * 1000.0, 2)
+        except asyncio.TimeoutError:
+            status = 'error'
+            error = 'timed out'
+        # Catch the remaining network/socket exceptions
+        except OSError as e:
+            status = 'error'
+            error = str(e)
+        finally:
+            if sock is not None:
+                sock.close()
+
+    return ScanResult(ip=ip, hostname=hostname, port=port, status=status,
+                      rtt_ms=rtt_ms, timestamp=timestamp, error=error)
+
+# -------------------------------
+# Function: _format_timestamp
+# -------------------------------
+@lru_cache(maxsize=8)
+def _format_second(t0_wall: datetime, sec: int) -> str:
+    """Format the anchor time plus a whole-second offset (cached)."""
+    return (t0_wall + timedelta(seconds=sec)).strftime('%Y-%m-%d %H:%M:%S')
+
+def _format_timestamp(t0_wall: datetime, t_rel: float) -> str:
+    """
+    Reconstruct a probe's wall-clock timestamp string from the sweep's
+    anchor time plus the monotonic offset captured in the hot path.
+    Timestamps have one-second resolution and a sweep completes thousands
+    of probes per second, so the strftime result is memoized per second —
+    the common case is a dict hit instead of a full format pass.
+    """
+    return _format_second(t0_wall, int(t_rel))
+
+# -------------------------------
+# Function: resolve_hostnames_async
+# -------------------------------
+async def resolve_hostnames_async(open_results):
+    """
+    Reverse-DNS every open host in one concurrent batch, after the sweep.
+    Each distinct IP is looked up exactly once — a multi-port scan can
+    produce many open rows for the same host. Lookups run on a dedicated
+    thread pool sized to the batch: asyncio's default executor has only
+    min(32, cpus + 4) threads, which would serialize a large batch behind
+    5-second DNS timeouts. Honors Ctrl+C between lookups; hosts not yet
+    resolved when the user stops are left blank. Returns the records with
+    their hostname field filled in.
+    """
+    unique_ips = list({r.ip for r in open_results})
+    if not unique_ips:
+        return open_results
+
+    print(f"\nResolving hostnames for {len(unique_ips)} open host(s)...")
+
+    def lookup(ip):
+        try:
+            # NI_NAMEREQD makes getnameinfo fail instead of echoing the IP
+            # back when no name is registered for it
+            return socket.getnameinfo((ip, 0), socket.NI_NAMEREQD)[0]
+        except (socket.herror, socket.gaierror, OSError):
+            return ''
+
+    loop = asyncio.get_running_loop()
+    ip_to_host = dict.fromkeys(unique_ips, '')
+    pool = ThreadPoolExecutor(
+        max_workers=min(len(unique_ips), MAX_RESOLVER_THREADS))
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(timeout)
-
-        start = time.perf_counter()
-        code = sock.connect_ex((ip, port))
-        end = time.perf_counter()
-
-        rtt = (end - start) * 1000.0  # convert to milliseconds
-        result['rtt_ms'] = round(rtt, 2)
-
-        if code == 0:
-            result['status'] = 'open'
-
-            # Hostname Lookup (Reverse DNS)
-            try:
-                # gethostbyaddr returns (hostname, aliases, ipaddrlist). We take the first element (hostname)
-                hostname = socket.gethostbyaddr(ip)[0]
-                result['hostname'] = hostname
-            except (socket.herror, socket.gaierror):
-                # Heror/Gaierror means the IP is active but no registered name was found
-                result['hostname'] = ''
-        else:
-            result['status'] = 'closed'
+        futures = {ip: loop.run_in_executor(pool, lookup, ip)
+                   for ip in unique_ips}
+        for ip, future in futures.items():
+            if not scanning_active:
+                break
+            ip_to_host[ip] = await future
+    finally:
+        # wait=False so a Ctrl+C here doesn't hang on threads still stuck
+        # in slow lookups
+        pool.shutdown(wait=False)
+
+    return [r._replace(hostname=ip_to_host[r.ip]) for r in open_results]
 
-        sock.close()
+# -------------------------------
+# Function: scan_ip_range_async
+# -------------------------------
+async def scan_ip_range_async(ips, ports=(80,), timeout=1.0, concurrency=2000,
+                              writer=None, include_closed=False):
+    """
+    Drive all (ip, port) probes through one event loop, capped by a
+    semaphore. Each finished probe is streamed straight into the CSV writer
+    instead of being buffered, so memory stays proportional to the number of
+    open hosts rather than the size of the range. Closed/error rows are only
+    written when include_closed is set — on a typical sweep they outnumber
+    hits a thousand to one and just bloat the CSV.
+
+    Targets are fed through a bounded queue to a fixed pool of worker
+    coroutines, so only the in-flight slice of the ip x port product exists
+    as objects at any moment — pre-building one task per probe would cost
+    gigabytes on a /16 x many-ports sweep.
+    Returns (open_results, scanned_count).
+    """
+    # Wall-clock and monotonic anchors are read once per sweep; probes only
+    # record an offset from t0_mono
+    t0_wall = datetime.now()
+    t0_mono = time.perf_counter()
+
+    # The requested budget is capped by the fd soft limit: 2000 in-flight
+    # sockets would blow straight through a stock 1024-fd allowance
+    current = min(max_safe_concurrency(concurrency), len(ips) * len(ports))
+    semaphore = asyncio.Semaphore(current)
+    # The adaptive controller's ceiling honors the same fd clamp, so a scan
+    # that starts safely cannot ramp itself into EMFILE territory
+    max_concurrency = max_safe_concurrency(MAX_CONCURRENCY)
+    window = []  # rtt_ms of recently completed probes; None for a failure
+
+    async def adjust_concurrency():
+        # AIMD controller: a fixed cap is either wasteful on LAN or abusive
+        # over WAN. Grow the in-flight budget additively while the median
+        # RTT shows plenty of headroom, and halve it when failures spike
+        # (timeouts or refused bursts from an overwhelmed path).
+        nonlocal current
+        while True:
+            await asyncio.sleep(0.2)
+            samples, window[:] = window[:], []
+            if len(samples) < 20:
+                continue
+            failures = sum(1 for rtt in samples if rtt is None)
+            if failures > len(samples) * 0.05:
+                shrink = min(current - MIN_CONCURRENCY, current // 2)
+                if shrink > 0:
+                    # Park permits one by one; they free up as probes finish
+                    for _ in range(shrink):
+                        await semaphore.acquire()
+                    current -= shrink
+                    print(f"[adaptive] {failures}/{len(samples)} failures, "
+                          f"concurrency lowered to {current}")
+            else:
+                rtts = sorted(rtt for rtt in samples if rtt is not None)
+                if rtts and rtts[len(rtts) // 2] < timeout * 1000.0 * 0.2:
+                    grow = min(max_concurrency - current, max(1, current // 10))
+                    if grow > 0:
+                        for _ in range(grow):
+                            semaphore.release()
+                        current += grow
+
+    total = len(ips) * len(ports)
+    num_workers = min(max_concurrency, total)
+    queue = asyncio.Queue(maxsize=num_workers * 4)
+    open_results = []
+    scanned = 0
+    # Progress is reported every ~5% of the sweep; cached here so the
+    # completion path below does a single modulo, not a division per probe
+    progress_step = max(1, total // 20)
+
+    async def producer():
+        # Lazily walk the cartesian product; the bounded put() blocks until
+        # workers catch up, so pending targets never pile up in memory
+        for target in itertools.product(ips, ports):
+            if not scanning_active:
+                break
+            await queue.put(target)
+        for _ in range(num_workers):
+            await queue.put(None)  # One stop marker per worker
+
+    async def worker():
+        nonlocal scanned
+        while True:
+            target = await queue.get()
+            if target is None:
+                break
+            result = await scan_ip(target[0], target[1], timeout,
+                                   semaphore, t0_mono)
+            if result is None:  # Probe skipped because the scan was stopped
+                continue
+            window.append(result.rtt_ms)
+            result = result._replace(
+                timestamp=_format_timestamp(t0_wall, result.timestamp))
+            scanned += 1
+            if scanned % progress_step == 0 and total > 1000:
+                # The wall-clock read happens only on this rare branch —
+                # never once per completion
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] "
+                      f"Progress: {scanned}/{total} probes")
+            if result.status == 'open':
+                # Held back until the hostname batch below has run
+                open_results.append(result)
+            elif writer is not None and include_closed:
+                # ScanResult fields are already in CSV column order
+                writer.writerow(result)
+
+    controller = asyncio.ensure_future(adjust_concurrency())
+    await asyncio.gather(producer(), *(worker() for _ in range(num_workers)))
+    controller.cancel()
+
+    # Resolve hostnames for the (few) open hosts in one concurrent batch,
+    # then flush their rows with the hostname column filled in.
+    # writerows loops in C — ScanResult records are already CSV-ordered
+    # tuples, so no per-row Python dispatch is needed
+    open_results = await resolve_hostnames_async(open_results)
+    if writer is not None:
+        writer.writerows(open_results)
+
+    return open_results, scanned
 
-    # Catch common network/socket exceptions
-    except (socket.timeout, ConnectionRefusedError, OSError) as e:
-        result['status'] = 'error'
-        result['error'] = str(e)
+# -------------------------------
+# Function: _scan_shard
+# -------------------------------
+def _scan_shard(args):
+    """Worker-process entry point: scan one slice of the range in its own
+    asyncio loop. Must be a module-level function so the pool can pickle it."""
+    ips, ports, timeout, concurrency = args
+    return asyncio.run(scan_ip_range_async(ips, ports, timeout, concurrency))
 
-    return result
+# -------------------------------
+# Function: multiprocess_scan_ip_range
+# -------------------------------
+def multiprocess_scan_ip_range(ips, ports=(80,), timeout=1.0, concurrency=2000,
+                               writer=None):
+    """
+    Shard a large range across one worker process per CPU core, each
+    driving its own asyncio event loop over a disjoint slice. A single
+    loop runs on one thread and is GIL-bound; independent loops let every
+    core push probes in parallel. Workers return only their open-port rows
+    to keep inter-process traffic small, so in this mode closed/error rows
+    are not recorded in the CSV. Returns (open_results, scanned_count).
+    """
+    procs = min(os.cpu_count() or 1, len(ips))
+    # Interleaved slices spread live subnets evenly across workers
+    shards = [ips[i::procs] for i in range(procs)]
+    per_worker = max(1, concurrency // procs)
+
+    open_results = []
+    scanned = 0
+    with multiprocessing.Pool(processes=procs) as pool:
+        jobs = [(shard, ports, timeout, per_worker) for shard in shards]
+        for shard_open, shard_scanned in pool.imap_unordered(_scan_shard, jobs):
+            open_results.extend(shard_open)
+            scanned += shard_scanned
+
+    if writer is not None:
+        writer.writerows(open_results)
+
+    return open_results, scanned
+
+# -------------------------------
+# Function: raw_syn_scan_available
+# -------------------------------
+def raw_syn_scan_available():
+    """Raw SYN scanning needs root (CAP_NET_RAW) and scapy installed."""
+    if not hasattr(os, 'geteuid') or os.geteuid() != 0:
+        return False
+    try:
+        import scapy.all  # noqa: F401 — only probing for availability
+    except ImportError:
+        return False
+    return True
+
+# -------------------------------
+# Function: syn_scan_ip_range
+# -------------------------------
+def syn_scan_ip_range(ips, ports=(80,), timeout=1.0, writer=None,
+                      include_closed=False):
+    """
+    Half-open (SYN) scan of the range using raw packets via scapy.
+    One SYN goes out per target and one shared raw socket collects the
+    replies: SYN-ACK means open, RST means closed, silence means filtered
+    or down. Compared to a full connect() this skips the handshake
+    completion and teardown, and consumes no ephemeral ports at all.
+    Returns (open_results, scanned_count).
+    """
+    from scapy.all import IP, TCP, sr  # imported lazily: scapy is optional
+
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    answered, unanswered = sr(IP(dst=ips) / TCP(dport=list(ports), flags='S'),
+                              timeout=timeout, verbose=0)
+
+    open_results = []
+    scanned = 0
+    for sent, received in answered:
+        scanned += 1
+        rtt_ms = round((received.time - sent.sent_time) * 1000.0, 2)
+        # 0x12 = SYN+ACK; anything else (normally an RST) means closed
+        is_open = received.haslayer(TCP) and (received[TCP].flags & 0x12) == 0x12
+        result = ScanResult(ip=sent[IP].dst, hostname='', port=sent[TCP].dport,
+                            status='open' if is_open else 'closed',
+                            rtt_ms=rtt_ms, timestamp=timestamp, error='')
+        if is_open:
+            open_results.append(result)
+        elif writer is not None and include_closed:
+            writer.writerow(result)
+    for sent in unanswered:
+        scanned += 1
+        if writer is not None and include_closed:
+            writer.writerow(ScanResult(ip=sent[IP].dst, hostname='',
+                                       port=sent[TCP].dport, status='error',
+                                       rtt_ms=None, timestamp=timestamp,
+                                       error='no response'))
+
+    # Same post-pass as the connect scan: resolve and flush open rows
+    open_results = asyncio.run(resolve_hostnames_async(open_results))
+    if writer is not None:
+        writer.writerows(open_results)
+
+    return open_results, scanned
 
 # -------------------------------
 # Function: scan_ip_range
 # -------------------------------
-def scan_ip_range(start_ip, end_ip, port=80, timeout=1.0, max_workers=100):
-    """Scan all IPs in the range concurrently using ThreadPoolExecutor."""
-    global scanning_active
-    
+def scan_ip_range(start_ip, end_ip, ports=(80,), timeout=1.0, concurrency=2000,
+                  use_raw=False, include_closed=False):
+    """
+    Scan all IPs in the range concurrently, writing results to a
+    timestamped CSV file as they arrive. Probes use asyncio connect()s, or
+    raw SYN packets when use_raw is set (root + scapy required). By default
+    only open ports are recorded in the CSV; pass include_closed to keep
+    closed/error rows as well.
+    Returns (open_results, scanned_count, csv_filename).
+    """
     ips = generate_ip_range(start_ip, end_ip)
-    results = []
 
-    print(f"Scanning {len(ips)} IP addresses on port {port}...")
+    mode = 'raw SYN probes' if use_raw else 'TCP connects'
+    ports_label = f"{len(ports)} ports" if len(ports) > 1 else f"port {ports[0]}"
+    print(f"Scanning {len(ips)} IP addresses on {ports_label} using {mode}...")
     print("Press Ctrl+C to stop the scan\n")
 
-    workers = min(max_workers, len(ips))
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        future_to_ip = {executor.submit(scan_ip, ip, port, timeout): ip for ip in ips}
-        for future in as_completed(future_to_ip):
-            if not scanning_active:
-                executor.shutdown(wait=False)
-                print("\nScan stopped by user!")
-                break
-                
-            try:
-                result = future.result()
-                if result:  # Only append if we got a result (not None)
-                    results.append(result)
-            except (socket.timeout, ConnectionRefusedError, OSError) as e:
-                if scanning_active:  # Only add errors if we're still scanning
-                    results.append({
-                        'ip': future_to_ip[future],
-                        'port': port,
-                        'status': 'error',
-                        'hostname': '',
-                        'rtt_ms': None,
-                        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        'error': str(e)
-                    })
-
-    return results
-
-# -------------------------------
-# Function: save_results_to_csv
-# -------------------------------
-def save_results_to_csv(results):
-    """Save scan results to a CSV file with a timestamped filename."""
     filename = f"scan_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    fieldnames = ['ip', 'hostname', 'port', 'status', 'rtt_ms', 'timestamp', 'error']
-
     with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        for row in results:
-            writer.writerow(row)
+        writer = csv.writer(csvfile)
+        writer.writerow(CSV_FIELDS)
+        if use_raw:
+            open_results, scanned = syn_scan_ip_range(
+                ips, ports, timeout, writer, include_closed)
+        elif (not include_closed
+              and len(ips) * len(ports) >= MULTIPROCESS_THRESHOLD
+              and (os.cpu_count() or 1) > 1):
+            # The sharded path only ships open rows between processes, so
+            # include_closed scans stay on the single-loop driver below
+            open_results, scanned = multiprocess_scan_ip_range(
+                ips, ports, timeout, concurrency, writer)
+        else:
+            open_results, scanned = asyncio.run(
+                scan_ip_range_async(ips, ports, timeout, concurrency, writer,
+                                    include_closed))
+
+    if not scanning_active:
+        print("\nScan stopped by user!")
 
-    return filename
+    return open_results, scanned, filename
 
 # -------------------------------
 # Function: display_online_hosts_with_hostnames
@@ -163,16 +583,14 @@ def display_online_hosts_with_hostnames(results):
     """Display only online hosts that have a valid hostname."""
     # Filter: only online hosts with non-empty hostnames
     online_hosts_with_names = [
-        r for r in results 
-        if r['status'] == 'open' and r['hostname'] and r['hostname'].strip()
+        r for r in results
+        if r.status == 'open' and r.hostname and r.hostname.strip()
     ]
-    
+
     if online_hosts_with_names:
         print("\nOnline IP Addresses and Hostnames:")
         for host in online_hosts_with_names:
-            ip = host['ip']
-            hostname = host['hostname'].strip()
-            print(f"{ip} - {hostname}")
+            print(f"{host.ip}:{host.port} - {host.hostname.strip()}")
     else:
         print("\nNo online hosts with hostnames found.")
 
@@ -214,37 +632,42 @@ def main():
                 print("No IP entered. Exiting.")
                 break
                 
-            port = input("Enter Port [Default 80]: ").strip()
+            ports_str = input("Enter Port(s), e.g. 80 or 22,80,443 or 1-1024 [Default 80]: ").strip()
             timeout = input("Enter Timeout in seconds [Default 1.0]: ").strip()
 
-            port = int(port) if port else 80
+            # parse_ports validates the 1-65535 bounds
+            ports = parse_ports(ports_str) if ports_str else [80]
             timeout = float(timeout) if timeout else 1.0
 
-            # Safety check for port range
-            if not (1 <= port <= 65535):
-                raise ValueError("Port number must be between 1 and 65535.")
+            closed_str = input("Include closed/error results in CSV? (y/n) [Default n]: ").strip().lower()
+            include_closed = closed_str in ['y', 'yes']
+
+            # Offer the faster half-open scan when it can actually work
+            use_raw = False
+            if raw_syn_scan_available():
+                raw = input("Use raw SYN scan? (y/n) [Default n]: ").strip().lower()
+                use_raw = raw in ['y', 'yes']
 
             start_time = time.time()
-            results = scan_ip_range(start_ip, end_ip, port=port, timeout=timeout)
+            open_results, scanned, csv_file = scan_ip_range(start_ip, end_ip, ports=ports, timeout=timeout, use_raw=use_raw, include_closed=include_closed)
             elapsed = time.time() - start_time
 
             # Display only online hosts with hostnames
-            display_online_hosts_with_hostnames(results)
-            
-            # Only save to CSV if we have results and scanning wasn't interrupted
-            if results and scanning_active:
-                csv_file = save_results_to_csv(results)
-                open_count = sum(1 for r in results if r['status'] == 'open')
-                open_with_hostname_count = sum(1 for r in results if r['status'] == 'open' and r['hostname'] and r['hostname'].strip())
+            display_online_hosts_with_hostnames(open_results)
+
+            # Rows were streamed to the CSV while scanning
+            if scanning_active:
+                open_with_hostname_count = sum(1 for r in open_results if r.hostname and r.hostname.strip())
 
                 print("\n=== Scan Summary ===")
-                print(f"Total IPs Scanned: {len(results)}")
-                print(f"Open Hosts Found: {open_count}")
+                print(f"Total Probes Sent: {scanned}")
+                print(f"Open Ports Found: {len(open_results)}")
                 print(f"Open Hosts With Hostnames: {open_with_hostname_count}")
                 print(f"Time Elapsed: {elapsed:.2f} seconds")
                 print(f"Results saved to: {csv_file}")
-            elif not scanning_active:
-                print(f"\nPartial scan completed: {len(results)} IPs scanned in {elapsed:.2f} seconds")
+            else:
+                print(f"\nPartial scan completed: {scanned} probes sent in {elapsed:.2f} seconds")
+                print(f"Partial results saved to: {csv_file}")
 
             # Ask if user wants to scan again
             while True: